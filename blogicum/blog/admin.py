@@ -24,6 +24,8 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('is_published', 'category', 'pub_date')
     search_fields = ('title', 'text')
     date_hierarchy = 'pub_date'
+    list_select_related = ('author', 'category')
+    raw_id_fields = ('author', 'category', 'location')
 
 
 @admin.register(Comment)
@@ -31,3 +33,5 @@ class CommentAdmin(admin.ModelAdmin):
     """Админ-класс для модели Comment."""
     list_display = ('author', 'post', 'created_at')
     search_fields = ('author__username', 'text')
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
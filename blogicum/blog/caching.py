@@ -0,0 +1,47 @@
+"""
+Кэширование фрагментов списков публикаций.
+
+Фрагменты сбрасываются сменой версии в сигналах post_save и post_delete
+моделей блога. Поэтому изменения, которые не вызывают сигналов, остаются
+невидимыми до истечения POST_LIST_CACHE_TIMEOUT. Это массовые изменения
+через QuerySet.update() или bulk_create(), а также отложенные публикации,
+у которых наступило время pub_date.
+
+CACHES в настройках не задан, поэтому используется LocMemCache, свой
+в каждом процессе. Сигнал меняет версию только в процессе, который
+обработал изменение. При нескольких рабочих процессах остальные отдают
+старые фрагменты и количества публикаций до истечения таймаутов.
+Чтобы сброс действовал во всех процессах, в CACHES нужно указать общий
+бэкенд, например Redis или Memcached.
+"""
+import time
+
+from django.core.cache import cache
+
+# Время жизни закэшированных фрагментов списков публикаций, в секундах
+POST_LIST_CACHE_TIMEOUT = 60
+
+# Время жизни закэшированного количества публикаций, в секундах
+POST_COUNT_CACHE_TIMEOUT = 30
+
+# Ключ, под которым хранится текущая версия кэша списков публикаций
+POSTS_CACHE_VERSION_KEY = 'blog:posts_cache_version'
+
+
+def get_posts_cache_version():
+    """
+    Возвращает текущую версию кэша списков публикаций.
+
+    Версия входит в ключ фрагментов шаблонов, поэтому её смена
+    делает все ранее закэшированные фрагменты недействительными.
+    """
+    return cache.get_or_set(POSTS_CACHE_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_posts_cache():
+    """Сбрасывает закэшированные фрагменты списков публикаций."""
+    try:
+        # Увеличение версии не зависит от разрешения системных часов
+        cache.incr(POSTS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(POSTS_CACHE_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,37 @@
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.template.utils import get_app_template_dirs
+
+# Подсчёт комментариев в шаблоне выполняет отдельный запрос на каждый пост
+COMMENTS_COUNT_PATTERN = re.compile(r'\.comments\.count\b')
+
+
+@register(Tags.templates)
+def check_comments_count_in_templates(app_configs, **kwargs):
+    """
+    Предупреждает об использовании post.comments.count в шаблонах.
+
+    Количество комментариев должно браться из аннотации comment_count.
+    """
+    directories = [
+        directory
+        for engine in settings.TEMPLATES
+        for directory in engine.get('DIRS', [])
+    ]
+    # Шаблоны приложений подключены через app_directories.Loader
+    directories.extend(get_app_template_dirs('templates'))
+    warnings = []
+    for directory in directories:
+        for path in sorted(Path(directory).rglob('*.html')):
+            content = path.read_text(encoding='utf-8')
+            if COMMENTS_COUNT_PATTERN.search(content):
+                warnings.append(Warning(
+                    'Шаблон считает комментарии через comments.count.',
+                    hint='Используйте аннотацию post.comment_count.',
+                    obj=str(path),
+                    id='blog.W001',
+                ))
+    return warnings
@@ -1,12 +1,15 @@
 from django import forms
-from .models import Post
+from .models import Comment, Post
 
 
 class PostForm(forms.ModelForm):
     """Форма для создания и редактирования публикации."""
     class Meta:
         model = Post
-        fields = ['title', 'text', 'image', 'is_published', 'pub_date', 'category', 'location']
+        fields = [
+            'title', 'text', 'category', 'location',
+            'pub_date', 'is_published', 'image'
+        ]
         widgets = {
             'title': forms.TextInput(attrs={
                 'class': 'form-control',
@@ -23,10 +26,14 @@ class PostForm(forms.ModelForm):
             'is_published': forms.CheckboxInput(attrs={
                 'class': 'form-check-input',
             }),
-            'pub_date': forms.DateTimeInput(attrs={
-                'class': 'form-control',
-                'type': 'datetime-local',
-            }),
+            'pub_date': forms.DateTimeInput(
+                # Формат, который понимает поле datetime-local в браузере
+                format='%Y-%m-%dT%H:%M',
+                attrs={
+                    'class': 'form-control',
+                    'type': 'datetime-local',
+                },
+            ),
             'category': forms.Select(attrs={
                 'class': 'form-control',
             }),
@@ -45,8 +52,8 @@ class PostForm(forms.ModelForm):
         }
 
 
-class CommentsForm(forms.ModelForm):
+class CommentForm(forms.ModelForm):
 
     class Meta:
-        model = Comments
+        model = Comment
         fields = ('text',)
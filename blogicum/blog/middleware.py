@@ -0,0 +1,26 @@
+from django.utils import timezone
+
+
+class RequestNowMiddleware:
+    """
+    Сохраняет текущее время в request.now.
+
+    Все проверки даты публикации в рамках запроса используют
+    одно и то же значение времени.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.now = timezone.now()
+        return self.get_response(request)
+
+
+def get_request_now(request):
+    """
+    Возвращает время, сохранённое RequestNowMiddleware, или None.
+
+    None означает, что методы PostQuerySet возьмут текущее время сами.
+    """
+    return getattr(request, 'now', None)
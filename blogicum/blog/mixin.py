@@ -1,36 +1,40 @@
 from django.shortcuts import get_object_or_404
-from django.utils.timezone import now
 from django.contrib.auth.mixins import UserPassesTestMixin
 from .models import Post, Comment
-
-
-class PostVisibilityMixin:
-    """Миксин для проверки видимости поста."""
-
-    def check_post_visibility(self, post, user):
-        if user == post.author:
-            return True
-        if not post.is_published or post.pub_date > now():
-            return False
-        if not post.category.is_published:
-            return False
-        return True
+from .paginator import CachedCountPaginator
 
 
 class AuthorRequiredMixin(UserPassesTestMixin):
     """Миксин для проверки авторства объекта, у которого есть поле 'author'."""
 
+    def get_object(self, queryset=None):
+        """
+        Возвращает объект, запоминая его на время запроса.
+
+        Объект нужен и для проверки авторства, и самому представлению,
+        поэтому повторные вызовы не обращаются к базе данных.
+        """
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_author_checked_object'):
+            self._author_checked_object = super().get_object()
+        return self._author_checked_object
+
     def test_func(self):
-        obj = self.get_object()
-        return self.request.user == obj.author
+        return self.get_object().author_id == self.request.user.pk
 
 
 class SinglePostObjectMixin:
     """Миксин для получения поста по pk или post_pk."""
 
     def get_post(self):
-        post_id = self.kwargs.get('post_pk') or self.kwargs.get('pk')
-        return get_object_or_404(Post, pk=post_id)
+        if not hasattr(self, '_post'):
+            post_id = self.kwargs.get('post_pk') or self.kwargs.get('pk')
+            self._post = get_object_or_404(
+                Post.objects.select_related('author', 'category'),
+                pk=post_id
+            )
+        return self._post
 
     def get_object(self, queryset=None):
         return self.get_post()
@@ -40,9 +44,41 @@ class SingleCommentObjectMixin:
     """Миксин для получения комментария по comment_pk и post_pk."""
 
     def get_comment(self):
-        comment_id = self.kwargs.get('comment_pk')
-        post_id = self.kwargs.get('post_pk') or self.kwargs.get('pk')
-        return get_object_or_404(Comment, id=comment_id, post__pk=post_id)
+        if not hasattr(self, '_comment'):
+            comment_id = self.kwargs.get('comment_pk')
+            post_id = self.kwargs.get('post_pk') or self.kwargs.get('pk')
+            self._comment = get_object_or_404(
+                Comment.objects.select_related('author'),
+                id=comment_id,
+                post__pk=post_id
+            )
+        return self._comment
 
     def get_object(self, queryset=None):
         return self.get_comment()
+
+
+class CachedCountMixin:
+    """Миксин для ListView, кэширующий количество объектов пагинатора."""
+
+    paginator_class = CachedCountPaginator
+
+    def get_count_cache_key(self):
+        """Возвращает ключ кэша для количества объектов списка."""
+        return None
+
+    def get_count_queryset(self):
+        """
+        Возвращает отфильтрованный QuerySet без аннотаций для подсчёта.
+
+        None означает, что считается сам список объектов.
+        """
+        return None
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args,
+            cache_key=self.get_count_cache_key(),
+            count_queryset=self.get_count_queryset(),
+            **kwargs
+        )
@@ -1,9 +1,15 @@
 from django.db import models
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 
 User = get_user_model()
 
+# Количество символов текста публикации, выбираемых для карточки в списках
+TEXT_PREVIEW_LENGTH = 300
+
 
 class Main(models.Model):
     """Абстрактная базовая модель с общими полями."""
@@ -54,6 +60,47 @@ class Location(Main):
         verbose_name_plural = 'Местоположения'
 
 
+class PostQuerySet(models.QuerySet):
+    """Набор запросов для публикаций."""
+
+    @staticmethod
+    def published_lookup(now=None):
+        """
+        Возвращает условие отбора публикаций, опубликованных к моменту now.
+
+        Если now не передан, используется текущее время.
+        """
+        return Q(
+            is_published=True,
+            pub_date__lte=now or timezone.now(),
+            category__is_published=True,
+        )
+
+    def published(self, now=None):
+        """Возвращает опубликованные публикации в опубликованных категориях."""
+        return self.filter(self.published_lookup(now))
+
+    def visible_to(self, user, now=None):
+        """Возвращает опубликованные публикации и собственные посты user."""
+        lookup = self.published_lookup(now)
+        if user.is_authenticated:
+            lookup |= Q(author=user)
+        return self.filter(lookup)
+
+    def for_list(self, related=('category', 'author', 'location')):
+        """
+        Подготавливает публикации для вывода списком.
+
+        Подгружает связанные объекты related, считает комментарии
+        в comment_count и вместо полного текста выбирает его начало
+        в text_preview.
+        """
+        return self.select_related(*related).defer('text').annotate(
+            comment_count=Count('comments'),
+            text_preview=Substr('text', 1, TEXT_PREVIEW_LENGTH),
+        ).order_by('-pub_date')
+
+
 class Post(Main):
     """Модель публикации с содержимым и связями."""
     title = models.CharField('Название', max_length=256)
@@ -88,6 +135,8 @@ class Post(Main):
         related_name='posts',
     )
 
+    objects = PostQuerySet.as_manager()
+
     def __str__(self):
         """Возвращает строковое представление публикации."""
         return self.title
@@ -100,9 +149,19 @@ class Post(Main):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
-
-
-class Comments(models.Model):
+        indexes = [
+            models.Index(
+                fields=['is_published', 'pub_date'],
+                name='post_published_pubdate_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='post_author_pubdate_idx',
+            ),
+        ]
+
+
+class Comment(models.Model):
     """Модель комментария к публикации."""
     post = models.ForeignKey(
         Post,
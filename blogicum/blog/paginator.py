@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .caching import POST_COUNT_CACHE_TIMEOUT, get_posts_cache_version
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор, кэширующий общее количество объектов.
+
+    Количество хранится в кэше под ключом cache_key вместе с версией
+    кэша публикаций, поэтому сбрасывается при изменении данных.
+    Без cache_key количество считается при каждом запросе.
+    Если передан count_queryset, количество считается по нему,
+    а не по object_list.
+    """
+
+    def __init__(self, *args, cache_key=None, count_queryset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.count_queryset = count_queryset
+
+    def count_objects(self):
+        """
+        Считает объекты.
+
+        count_queryset не содержит аннотаций и select_related списка,
+        поэтому COUNT обходится без соединения с комментариями.
+        """
+        if self.count_queryset is not None:
+            return self.count_queryset.count()
+        return Paginator.count.func(self)
+
+    @cached_property
+    def count(self):
+        """Возвращает общее количество объектов, используя кэш."""
+        if self.cache_key is None:
+            return self.count_objects()
+        key = f'{self.cache_key}:{get_posts_cache_version()}'
+        return cache.get_or_set(
+            key, self.count_objects, POST_COUNT_CACHE_TIMEOUT
+        )
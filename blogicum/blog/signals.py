@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import invalidate_posts_cache
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Location)
+def reset_post_list_cache(sender, **kwargs):
+    """Сбрасывает кэш списков публикаций при изменении связанных данных."""
+    invalidate_posts_cache()
+
+
+@receiver([post_save, post_delete], sender=User)
+def reset_post_list_cache_for_user(sender, update_fields=None, **kwargs):
+    """
+    Сбрасывает кэш списков публикаций при изменении пользователя.
+
+    Обновление только времени последнего входа на списки не влияет.
+    """
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    invalidate_posts_cache()
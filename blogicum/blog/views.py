@@ -1,20 +1,24 @@
-from django.http import Http404
+import csv
+from itertools import chain
+
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, StreamingHttpResponse
 from django.views.generic import (
     DetailView, ListView, CreateView, UpdateView, DeleteView
 )
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
-from django.utils.timezone import now
+from django.urls import reverse
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login, authenticate, get_user_model
-from django.db.models import Count
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Prefetch
 
+from .caching import POST_LIST_CACHE_TIMEOUT, get_posts_cache_version
+from .middleware import get_request_now
 from .models import Post, Category, Comment
-from .forms import CommentForm
+from .forms import CommentForm, PostForm
 from .mixin import (
-    PostVisibilityMixin,
+    CachedCountMixin,
     AuthorRequiredMixin,
     SinglePostObjectMixin,
     SingleCommentObjectMixin
@@ -22,93 +26,76 @@ from .mixin import (
 
 User = get_user_model()
 
-# Поля, отображаемые при создании и редактировании публикации
-SHOWING_FIELDS = [
-    'title', 'text', 'category', 'location',
-    'pub_date', 'is_published', 'image'
-]
-
-
-def get_paginated_page(request, queryset, per_page=10):
-    """
-    Возвращает объект страницы с пагинацией.
-
-    :param request: HttpRequest объект.
-    :param queryset: QuerySet для пагинации.
-    :param per_page: Количество объектов на странице.
-    :return: Объект Page.
-    """
-    paginator = Paginator(queryset, per_page)
-    page = request.GET.get('page')
-    try:
-        paginated_page = paginator.page(page)
-    except PageNotAnInteger:
-        paginated_page = paginator.page(1)
-    except EmptyPage:
-        paginated_page = paginator.page(paginator.num_pages)
-    return paginated_page
-
-
-def annotate_comment_count(queryset):
-    """
-    Аннотирует переданный QuerySet количеством комментариев для каждого поста.
-    """
-    return queryset.annotate(comment_count=Count('comments'))
+# Столбцы CSV-выгрузки публикаций категории: заголовок и поля выборки
+EXPORT_HEADER = ('id', 'title', 'pub_date', 'author', 'comment_count')
+EXPORT_FIELDS = (
+    'pk', 'title', 'pub_date', 'author__username', 'comment_count'
+)
+# Количество строк, получаемых из базы данных за один раз при выгрузке
+EXPORT_CHUNK_SIZE = 500
 
 
-def filter_published_posts(queryset):
-    """
-    Фильтрует переданный QuerySet, оставляя только опубликованные посты.
+class EchoBuffer:
+    """Буфер для csv.writer, возвращающий записанную строку."""
 
-    :param queryset: Исходный QuerySet постов.
-    :return: Отфильтрованный QuerySet только с опубликованными постами.
-    """
-    return queryset.filter(is_published=True, pub_date__lte=now())
+    def write(self, value):
+        return value
 
 
-class Index(ListView):
+class Index(CachedCountMixin, ListView):
     """Главная страница блога с списком опубликованных публикаций."""
     model = Post
     template_name = 'blog/index.html'
-    paginate_by = 10  # Пагинация обрабатывается функцией
+    paginate_by = 10
 
     def get_queryset(self):
         """
         Получает опубликованные публикации
         с предварительной выборкой связанных объектов.
         """
-        queryset = Post.objects.filter(
-            category__is_published=True
-        ).select_related('category', 'author', 'location').order_by('-pub_date')
+        return self.get_count_queryset().for_list()
 
-        queryset = filter_published_posts(queryset)
-        return annotate_comment_count(queryset)
+    def get_count_queryset(self):
+        return Post.objects.published(get_request_now(self.request))
+
+    def get_count_cache_key(self):
+        return 'post_count:index'
 
     def get_context_data(self, **kwargs):
         """
-        Добавляет пагинированный набор постов в контекст.
+        Добавляет параметры кэширования списка публикаций в контекст.
         """
         context = super().get_context_data(**kwargs)
-        context['page_obj'] = get_paginated_page(self.request, self.get_queryset(), self.paginate_by)
+        context['cache_timeout'] = POST_LIST_CACHE_TIMEOUT
+        context['posts_cache_version'] = get_posts_cache_version()
         return context
 
 
-class PostDetail(PostVisibilityMixin, DetailView):
+class PostDetail(DetailView):
     """Детальная страница публикации с комментариями."""
     model = Post
     template_name = 'blog/detail.html'
     context_object_name = 'post'
     pk_url_kwarg = 'post_pk'  # Соответствует параметру из URL
 
-    def get_object(self, queryset=None):
+    def get_queryset(self):
         """
-        Получает объект публикации и проверяет его доступность.
-        Использует get_object_or_404() внутри DetailView.
+        Получает доступные пользователю публикации со связанными объектами
+        и предварительно выбранными комментариями с их авторами.
+        Недоступная публикация не попадает в выборку и даёт ошибку 404.
         """
-        post = super().get_object(queryset)
-        if not self.check_post_visibility(post, self.request.user):
-            raise Http404("Публикация не найдена.")
-        return post
+        return Post.objects.visible_to(
+            self.request.user, get_request_now(self.request)
+        ).select_related(
+            'category', 'author', 'location'
+        ).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.select_related(
+                    'author'
+                ).order_by('created_at')
+            )
+        )
 
     def get_context_data(self, **kwargs):
         """
@@ -117,13 +104,12 @@ class PostDetail(PostVisibilityMixin, DetailView):
         context = super().get_context_data(**kwargs)
         post = context['post']
         context['comments'] = post.comments.all()
-        context['comments_count'] = post.comments.count()
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
-class CategoryPosts(ListView):
+class CategoryPosts(CachedCountMixin, ListView):
     """Страница со списком публикаций по выбранной категории."""
     model = Category
     template_name = 'blog/category.html'
@@ -136,42 +122,90 @@ class CategoryPosts(ListView):
             slug=self.kwargs['category_slug'],
             is_published=True
         )
-        queryset = self.category.posts.select_related('category', 'author', 'location').order_by('-pub_date')
+        return self.get_count_queryset().for_list()
+
+    def get_count_queryset(self):
+        return self.category.posts.published(get_request_now(self.request))
+
+    def get_count_cache_key(self):
+        return f'post_count:category:{self.category.slug}'
 
-        queryset = filter_published_posts(queryset)
-        return annotate_comment_count(queryset)
+    def get(self, request, *args, **kwargs):
+        """
+        Отдаёт страницу категории или, при параметре export=1,
+        потоковую CSV-выгрузку всех её публикаций.
+        Выгрузка доступна только сотрудникам.
+        """
+        if request.GET.get('export') == '1':
+            if not request.user.is_staff:
+                raise PermissionDenied
+            return self.export_csv()
+        return super().get(request, *args, **kwargs)
+
+    def export_csv(self):
+        """
+        Выгружает публикации категории в CSV без пагинации и шаблонов.
+
+        Строки читаются из базы данных частями и сразу отдаются клиенту,
+        поэтому список публикаций не хранится в памяти целиком.
+        """
+        rows = self.get_queryset().values_list(
+            *EXPORT_FIELDS
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        writer = csv.writer(EchoBuffer())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in chain([EXPORT_HEADER], rows)),
+            content_type='text/csv',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.category.slug}.csv"'
+        )
+        return response
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
-        context['page_obj'] = get_paginated_page(self.request, self.get_queryset(), self.paginate_by)
+        context['cache_timeout'] = POST_LIST_CACHE_TIMEOUT
+        context['posts_cache_version'] = get_posts_cache_version()
         return context
 
 
-class ProfileView(ListView):
+class ProfileView(CachedCountMixin, ListView):
     """Профиль пользователя с его публикациями."""
     model = Post
     template_name = 'blog/profile.html'
-    context_object_name = 'page_obj'
+    context_object_name = 'post_list'
     paginate_by = 10
 
     def get_queryset(self):
         self.profile = get_object_or_404(
             User, username=self.kwargs['username']
         )
-        queryset = Post.objects.filter(author=self.profile).select_related(
-            'category', 'author', 'location'
-        ).order_by('-pub_date')
+        # Автор у всех постов один, он подставляется в get_context_data
+        return self.get_count_queryset().for_list(
+            related=('category', 'location')
+        )
+
+    def get_count_queryset(self):
+        queryset = Post.objects.filter(author=self.profile)
         if self.request.user != self.profile:
-            queryset = filter_published_posts(queryset)
+            queryset = queryset.published(get_request_now(self.request))
+        return queryset
 
-        return annotate_comment_count(queryset)
+    def get_count_cache_key(self):
+        # Автор видит и неопубликованные посты, поэтому счётчики различаются
+        is_owner = self.request.user == self.profile
+        return f'post_count:profile:{self.profile.pk}:{is_owner}'
 
     def get_context_data(self, **kwargs):
-        """ Добавляет объект профиля в контекст. """
+        """
+        Добавляет объект профиля в контекст
+        и назначает его автором постов страницы без лишних запросов.
+        """
         context = super().get_context_data(**kwargs)
         context['profile'] = self.profile
-        context['page_obj'] = get_paginated_page(self.request, self.get_queryset(), self.paginate_by)
+        for post in context['page_obj'].object_list:
+            post.author = self.profile
         return context
 
 
@@ -179,7 +213,7 @@ class CreatePost(LoginRequiredMixin, CreateView):
     """Создание новой публикации."""
     model = Post
     template_name = 'blog/create.html'
-    fields = SHOWING_FIELDS
+    form_class = PostForm
 
     def form_valid(self, form):
         """
@@ -193,14 +227,16 @@ class CreatePost(LoginRequiredMixin, CreateView):
         Перенаправление на профиль
         пользователя после успешного создания публикации.
         """
-        return redirect('blog:profile', username=self.request.user.username)
+        return reverse(
+            'blog:profile', kwargs={'username': self.request.user.username}
+        )
 
 
 class EditPost(LoginRequiredMixin, AuthorRequiredMixin, UpdateView):
     """Редактирование существующей публикации."""
     model = Post
     template_name = 'blog/create.html'
-    fields = SHOWING_FIELDS
+    form_class = PostForm
     pk_url_kwarg = 'post_pk'  # Соответствует параметру из URL
 
     def get_success_url(self):
@@ -208,7 +244,7 @@ class EditPost(LoginRequiredMixin, AuthorRequiredMixin, UpdateView):
         Перенаправление на детальную страницу публикации
         после успешного редактирования.
         """
-        return redirect('blog:post_detail', post_pk=self.object.pk)
+        return reverse('blog:post_detail', kwargs={'post_pk': self.object.pk})
 
     def handle_no_permission(self):
         """
@@ -228,7 +264,9 @@ class RegistrationView(CreateView):
         """
         Перенаправление на профиль пользователя после успешной регистрации.
         """
-        return redirect('blog:profile', username=self.object.username)
+        return reverse(
+            'blog:profile', kwargs={'username': self.object.username}
+        )
 
     def form_valid(self, form):
         """
@@ -260,7 +298,9 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
         """
         Перенаправление на профиль пользователя после успешного редактирования.
         """
-        return redirect('blog:profile', username=self.object.username)
+        return reverse(
+            'blog:profile', kwargs={'username': self.object.username}
+        )
 
 
 class AddCommentView(LoginRequiredMixin, CreateView):
@@ -273,12 +313,14 @@ class AddCommentView(LoginRequiredMixin, CreateView):
         """
         Устанавливает автора комментария и связывает его
         с соответствующей публикацией.
-        Использует get_object_or_404() для извлечения публикации.
+        Публикация не загружается: достаточно проверить её существование
+        и указать идентификатор.
         """
         post_pk = self.kwargs.get('post_pk')  # Соответствует параметру из URL
-        post = get_object_or_404(Post, pk=post_pk)
+        if not Post.objects.filter(pk=post_pk).exists():
+            raise Http404('Публикация не найдена.')
         form.instance.author = self.request.user
-        form.instance.post = post
+        form.instance.post_id = post_pk
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -286,7 +328,9 @@ class AddCommentView(LoginRequiredMixin, CreateView):
         Перенаправление на детальную страницу
         публикации после успешного добавления комментария.
         """
-        return redirect('blog:post_detail', post_pk=self.object.post.pk)
+        return reverse(
+            'blog:post_detail', kwargs={'post_pk': self.object.post_id}
+        )
 
 
 class EditCommentView(LoginRequiredMixin,
@@ -304,7 +348,9 @@ class EditCommentView(LoginRequiredMixin,
         Перенаправление на детальную страницу
         публикации после успешного редактирования комментария.
         """
-        return redirect('blog:post_detail', post_pk=self.object.post.pk)
+        return reverse(
+            'blog:post_detail', kwargs={'post_pk': self.object.post_id}
+        )
 
 
 class DeletePostView(LoginRequiredMixin,
@@ -321,7 +367,9 @@ class DeletePostView(LoginRequiredMixin,
         Перенаправление на профиль
         пользователя после успешного удаления публикации.
         """
-        return redirect('blog:profile', username=self.request.user.username)
+        return reverse(
+            'blog:profile', kwargs={'username': self.request.user.username}
+        )
 
 
 class DeleteCommentView(LoginRequiredMixin,
@@ -338,4 +386,6 @@ class DeleteCommentView(LoginRequiredMixin,
         Перенаправление на детальную страницу
         публикации после успешного удаления комментария.
         """
-        return redirect('blog:post_detail', post_pk=self.object.post.pk)
+        return reverse(
+            'blog:post_detail', kwargs={'post_pk': self.object.post_id}
+        )
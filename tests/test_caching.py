@@ -0,0 +1,169 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.caching import get_posts_cache_version
+
+
+@pytest.fixture
+def cached_post(mixer, user):
+    category = mixer.blend(
+        "blog.Category", title="Исходная категория", is_published=True
+    )
+    location = mixer.blend(
+        "blog.Location", name="Исходное место", is_published=True
+    )
+    return mixer.blend(
+        "blog.Post",
+        title="Исходный заголовок",
+        author=user,
+        category=category,
+        location=location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def list_urls(post):
+    return ["/", f"/category/{post.category.slug}/"]
+
+
+def get_content(client, url):
+    return client.get(url).content.decode("utf-8")
+
+
+def change_post(post, mixer):
+    def apply():
+        post.title = "Новый заголовок"
+        post.save()
+    return apply, "Новый заголовок", True
+
+
+def delete_post(post, mixer):
+    return post.delete, "Исходный заголовок", False
+
+
+def add_comment(post, mixer):
+    def apply():
+        mixer.blend("blog.Comment", post=post, author=post.author)
+    return apply, "Комментарии (1)", True
+
+
+def delete_comment(post, mixer):
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    return comment.delete, "Комментарии (0)", True
+
+
+def change_category(post, mixer):
+    def apply():
+        post.category.title = "Новая категория"
+        post.category.save()
+    return apply, "Новая категория", True
+
+
+def change_location(post, mixer):
+    def apply():
+        post.location.name = "Новое место"
+        post.location.save()
+    return apply, "Новое место", True
+
+
+def delete_location(post, mixer):
+    return post.location.delete, "Исходное место", False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "change",
+    [
+        change_post, delete_post, add_comment, delete_comment,
+        change_category, change_location, delete_location,
+    ],
+)
+def test_post_list_fragments_refresh(mixer, client, cached_post, change):
+    urls = list_urls(cached_post)
+    apply, expected, present = change(cached_post, mixer)
+    for url in urls:
+        assert "Исходный заголовок" in get_content(client, url)
+    apply()
+    for url in urls:
+        assert (expected in get_content(client, url)) is present, (
+            f"Убедитесь, что список публикаций на {url} обновляется после"
+            f" изменения `{change.__name__}`."
+        )
+
+
+@pytest.mark.django_db
+def test_category_delete_refreshes_index(client, cached_post):
+    assert "Исходный заголовок" in get_content(client, "/")
+    cached_post.category.delete()
+    assert "Исходный заголовок" not in get_content(client, "/")
+
+
+@pytest.mark.django_db
+def test_last_login_save_keeps_cache_version(user):
+    version = get_posts_cache_version()
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+    assert get_posts_cache_version() == version
+    user.first_name = "Новое имя"
+    user.save()
+    assert get_posts_cache_version() != version
+
+
+@pytest.mark.django_db
+def test_paginator_count_resets_on_new_post(client, cached_post, mixer):
+    assert client.get("/").context["page_obj"].paginator.count == 1
+    mixer.blend(
+        "blog.Post",
+        author=cached_post.author,
+        category=cached_post.category,
+        is_published=True,
+        pub_date=cached_post.pub_date,
+    )
+    assert client.get("/").context["page_obj"].paginator.count == 2
+
+
+@pytest.mark.django_db
+def test_paginator_count_counts_posts_not_comments(
+        client, cached_post, mixer
+):
+    mixer.cycle(3).blend(
+        "blog.Comment", post=cached_post, author=cached_post.author
+    )
+    for url in list_urls(cached_post):
+        # Второй запрос берёт количество из кэша
+        for _ in range(2):
+            paginator = client.get(url).context["page_obj"].paginator
+            assert paginator.count == 1, (
+                "Убедитесь, что пагинатор считает публикации, а не строки"
+                " с комментариями."
+            )
+
+
+@pytest.mark.django_db
+def test_paginator_count_query_skips_comments(
+        client, user_client, cached_post, mixer
+):
+    mixer.blend("blog.Comment", post=cached_post, author=cached_post.author)
+    profile_url = f"/profile/{cached_post.author.username}/"
+    for page_client, url in [
+        *((client, url) for url in list_urls(cached_post)),
+        (client, profile_url),
+        (user_client, profile_url),
+    ]:
+        with CaptureQueriesContext(connection) as queries:
+            page_client.get(url)
+        count_queries = [
+            query["sql"] for query in queries.captured_queries
+            if "COUNT(*)" in query["sql"]
+        ]
+        assert count_queries, url
+        for sql in count_queries:
+            assert "blog_comment" not in sql, (
+                f"Убедитесь, что на {url} количество публикаций считается"
+                " без соединения с таблицей комментариев."
+            )
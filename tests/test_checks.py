@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.test import override_settings
+
+from blog.checks import check_comments_count_in_templates
+
+
+def templates_with_dir(directory):
+    return [{**settings.TEMPLATES[0], "DIRS": [directory]}]
+
+
+def test_comments_count_in_template_is_reported(tmp_path):
+    template = tmp_path / "post.html"
+    template.write_text("{{ post.comments.count }}", encoding="utf-8")
+    with override_settings(TEMPLATES=templates_with_dir(tmp_path)):
+        warnings = check_comments_count_in_templates(None)
+    assert [w.id for w in warnings] == ["blog.W001"]
+    assert warnings[0].obj == str(template)
+
+
+def test_project_templates_pass_comments_count_check():
+    assert check_comments_count_in_templates(None) == []
@@ -0,0 +1,71 @@
+import csv
+import io
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test.client import Client
+from django.utils import timezone
+
+
+@pytest.fixture
+def staff_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend(get_user_model(), is_staff=True))
+    return client
+
+
+@pytest.fixture
+def category_with_posts(mixer, user):
+    category = mixer.blend("blog.Category", is_published=True)
+    past = timezone.now() - timedelta(days=1)
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=category,
+        is_published=True, pub_date=past,
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=category,
+        is_published=False, pub_date=past,
+    )
+    return category
+
+
+def export_url(category, value="1"):
+    return f"/category/{category.slug}/?export={value}"
+
+
+@pytest.mark.django_db
+def test_category_export(staff_client, category_with_posts):
+    response = staff_client.get(export_url(category_with_posts))
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "text/csv"
+    content = b"".join(response.streaming_content).decode("utf-8")
+    rows = list(csv.reader(io.StringIO(content)))
+    assert rows[0] == ["id", "title", "pub_date", "author", "comment_count"]
+    assert len(rows) == 1 + 3
+
+
+@pytest.mark.django_db
+def test_category_export_hidden_category(mixer, staff_client):
+    category = mixer.blend("blog.Category", is_published=False)
+    response = staff_client.get(export_url(category))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_category_export_forbidden_for_non_staff(
+        user_client, unlogged_client, category_with_posts
+):
+    for client in (user_client, unlogged_client):
+        response = client.get(export_url(category_with_posts))
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_category_export_requires_exact_flag(
+        staff_client, category_with_posts
+):
+    response = staff_client.get(export_url(category_with_posts, "0"))
+    assert response.status_code == HTTPStatus.OK
+    assert "text/html" in response["Content-Type"]
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def post_in_unpublished_category(mixer, user):
+    category = mixer.blend("blog.Category", is_published=False)
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_profile_hides_unpublished_category_posts_from_others(
+        user, user_client, another_user_client, post_in_unpublished_category
+):
+    url = f"/profile/{user.username}/"
+    response = another_user_client.get(url)
+    assert post_in_unpublished_category not in response.context["page_obj"], (
+        "Убедитесь, что на странице пользователя другим пользователям не"
+        " показываются публикации из снятых с публикации категорий."
+    )
+    response = user_client.get(url)
+    assert post_in_unpublished_category in response.context["page_obj"], (
+        "Убедитесь, что автор видит на своей странице публикации из снятых"
+        " с публикации категорий."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_post_count_differs_for_owner(
+        mixer, user, user_client, unlogged_client
+):
+    category = mixer.blend("blog.Category", is_published=True)
+    past = timezone.now() - timedelta(days=1)
+    mixer.blend(
+        "blog.Post", author=user, category=category,
+        is_published=True, pub_date=past,
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=category,
+        is_published=False, pub_date=past,
+    )
+    url = f"/profile/{user.username}/"
+    # Первый запрос кэширует количество для анонимного пользователя
+    anonymous_count = unlogged_client.get(url).context[
+        "page_obj"].paginator.count
+    owner_count = user_client.get(url).context["page_obj"].paginator.count
+    assert anonymous_count == 1
+    assert owner_count == 2
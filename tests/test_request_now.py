@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
+
+import blog.models
+from blog.views import Index
+
+
+@pytest.fixture
+def published_post(mixer, user):
+    category = mixer.blend("blog.Category", is_published=True)
+    return mixer.blend(
+        "blog.Post", author=user, category=category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+class NowForbidden:
+    @staticmethod
+    def now():
+        raise AssertionError(
+            "Время публикации должно браться из request.now."
+        )
+
+
+@pytest.mark.django_db
+def test_request_uses_single_now(monkeypatch, client, user, published_post):
+    monkeypatch.setattr(blog.models, "timezone", NowForbidden)
+    urls = (
+        "/",
+        f"/category/{published_post.category.slug}/",
+        f"/posts/{published_post.pk}/",
+        f"/profile/{user.username}/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert response.wsgi_request.now <= timezone.now()
+
+
+@pytest.mark.django_db
+def test_index_filters_by_request_now(rf, published_post):
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    request.now = published_post.pub_date - timedelta(hours=1)
+    view = Index()
+    view.setup(request)
+    assert published_post not in view.get_queryset()
+
+
+@pytest.mark.django_db
+def test_index_works_without_middleware(rf, published_post):
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    view = Index()
+    view.setup(request)
+    assert published_post in view.get_queryset()